@@ -1,10 +1,12 @@
 """Constants and dataclasses."""
 import json
 import logging
+import os
+import shutil
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from .dataclasses_json import DataClassJsonMixin
 
@@ -24,6 +26,15 @@ WIDTH = "75"
 HEIGHT = "20"
 LIST_HEIGHT = "12"
 
+# Resolve programs once instead of searching PATH on every spawn
+ARECORD = shutil.which("arecord") or "arecord"
+APLAY = shutil.which("aplay") or "aplay"
+SUDO = shutil.which("sudo") or "sudo"
+WHIPTAIL = shutil.which("whiptail") or "whiptail"
+
+# Last settings loaded from or saved to disk
+_SAVED_SETTINGS_DICT: Optional[Dict[str, Any]] = None
+
 
 class SatelliteType(str, Enum):
     ALWAYS_STREAMING = "always"
@@ -96,19 +107,33 @@ class Settings(DataClassJsonMixin):
 
     @staticmethod
     def load() -> "Settings":
+        global _SAVED_SETTINGS_DICT
+
         if SETTINGS_PATH.exists():
             _LOGGER.debug("Loading settings from %s", SETTINGS_PATH)
             with open(SETTINGS_PATH, "r", encoding="utf-8") as settings_file:
                 settings_dict = json.load(settings_file)
-                return Settings.from_dict(settings_dict)
+                settings = Settings.from_dict(settings_dict)
+                _SAVED_SETTINGS_DICT = settings.to_dict()
+                return settings
 
         return Settings()
 
     def save(self) -> None:
-        _LOGGER.debug("Saving settings to %s", SETTINGS_PATH)
+        global _SAVED_SETTINGS_DICT
 
         settings_dict = self.to_dict()
+        if settings_dict == _SAVED_SETTINGS_DICT:
+            # Nothing changed since last load/save
+            return
+
+        _LOGGER.debug("Saving settings to %s", SETTINGS_PATH)
         SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(SETTINGS_PATH, "w", encoding="utf-8") as settings_file:
+        # Write to a temporary file first so settings are never left half-written
+        temp_path = SETTINGS_PATH.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as settings_file:
             json.dump(settings_dict, settings_file, ensure_ascii=False, indent=2)
+
+        os.replace(temp_path, SETTINGS_PATH)
+        _SAVED_SETTINGS_DICT = settings_dict
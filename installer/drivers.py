@@ -2,7 +2,7 @@
 import sys
 from typing import Optional
 
-from .const import PROGRAM_DIR, Settings
+from .const import PROGRAM_DIR, SUDO, Settings
 from .whiptail import error, menu, msgbox, passwordbox, run_with_gauge, yesno
 
 
@@ -27,7 +27,7 @@ def install_drivers(settings: Settings) -> None:
                     "Installing drivers...",
                     [
                         [
-                            "sudo",
+                            SUDO,
                             "-S",
                             str(PROGRAM_DIR / "etc" / "install-respeaker-drivers.sh"),
                         ]
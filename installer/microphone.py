@@ -1,16 +1,22 @@
 """Microphone settings."""
 import array
+import functools
 import logging
 import math
+import operator
 import subprocess
-from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Dict, List, Optional
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
 
-from .const import RECORD_RMS_MIN, RECORD_SECONDS, Settings
+from .const import ARECORD, RECORD_RMS_MIN, RECORD_SECONDS, Settings
 from .whiptail import gauge, inputbox, menu, msgbox, radiolist
 
 _LOGGER = logging.getLogger()
 
+_RECORD_CHUNK_BYTES = 4096
+_RECORD_BUFFER_BYTES = 64 * 1024
+
 
 def configure_microphone(settings: Settings) -> None:
     choice: Optional[str] = None
@@ -23,13 +29,16 @@ def configure_microphone(settings: Settings) -> None:
             best_rms: Optional[float] = None
 
             devices = get_microphone_devices()
-            with ThreadPoolExecutor() as executor:
-                futures: Dict[str, Future] = {}
-                for device in devices:
-                    futures[device] = executor.submit(_record_proc, device)
+            # All devices must record while the prompt is shown. Threads only
+            # wait on arecord, so CPU count is not a useful limit.
+            with ThreadPoolExecutor(max_workers=max(1, len(devices))) as executor:
+                futures: Dict[Future, str] = {
+                    executor.submit(_record_proc, device): device for device in devices
+                }
 
                 gauge("Speak loudly into the microphone.", RECORD_SECONDS)
-                for device, future in futures.items():
+                for future in as_completed(futures):
+                    device = futures[future]
                     device_rms = future.result()
                     if device_rms is None:
                         _LOGGER.warning("Failed to record from microphone %s", device)
@@ -65,6 +74,9 @@ def configure_microphone(settings: Settings) -> None:
             if microphone_device:
                 settings.mic.device = microphone_device
                 settings.save()
+        elif choice == "rescan":
+            get_microphone_devices.cache_clear()
+            msgbox(f"Found {len(get_microphone_devices())} device(s)")
         elif choice == "manual":
             microphone_device = inputbox("Enter ALSA Device:", settings.mic.device)
             if microphone_device:
@@ -83,6 +95,7 @@ def microphone_menu(last_choice: Optional[str]) -> Optional[str]:
             ("detect", "Autodetect"),
             ("list", "Select From List"),
             ("manual", "Enter Manually"),
+            ("rescan", "Rescan Devices"),
             ("settings", "Audio Settings"),
         ],
         selected_item=last_choice,
@@ -90,54 +103,73 @@ def microphone_menu(last_choice: Optional[str]) -> Optional[str]:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_microphone_devices() -> List[str]:
     devices = []
-    lines = subprocess.check_output(["arecord", "-L"]).decode("utf-8").splitlines()
+    # Filter before decoding since most lines are discarded
+    lines = subprocess.check_output([ARECORD, "-L"]).splitlines()
     for line in lines:
         line = line.strip()
 
         # default = PulseAudio
-        if (line == "default") or line.startswith("plughw:"):
-            devices.append(line)
+        if (line == b"default") or line.startswith(b"plughw:"):
+            devices.append(line.decode("utf-8"))
 
     return devices
 
 
 def _record_proc(device: str) -> Optional[float]:
     try:
-        proc = subprocess.Popen(
-            [
-                "arecord",
-                "-q",
-                "-D",
-                device,
-                "-r",
-                "16000",
-                "-c",
-                "1",
-                "-f",
-                "S16_LE",
-                "-t",
-                "raw",
-                "-d",
-                str(RECORD_SECONDS),
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        audio, stderr = proc.communicate()
-        if proc.returncode != 0:
-            _LOGGER.error(
-                "Error recording from device %s: %s", device, stderr.decode("utf-8")
+        # Send stderr to a file so a full stderr pipe can't block arecord
+        # while stdout is being read.
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                [
+                    ARECORD,
+                    "-q",
+                    "-D",
+                    device,
+                    "-r",
+                    "16000",
+                    "-c",
+                    "1",
+                    "-f",
+                    "S16_LE",
+                    "-t",
+                    "raw",
+                    "-d",
+                    str(RECORD_SECONDS),
+                ],
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                bufsize=_RECORD_BUFFER_BYTES,
             )
-            return None
-
-        # 16-bit mono
-        audio_array = array.array("h", audio)
-        rms = math.sqrt(
-            (1 / len(audio_array) * sum(x * x for x in audio_array.tolist()))
-        )
-        return rms
+            assert proc.stdout is not None
+
+            # Accumulate while recording instead of buffering all of the audio
+            get_sum_squares = _get_sum_squares_func()
+            sum_squares = 0.0
+            num_samples = 0
+            while chunk := proc.stdout.read(_RECORD_CHUNK_BYTES):
+                # 16-bit mono
+                chunk = chunk[: len(chunk) - (len(chunk) % 2)]
+                sum_squares += get_sum_squares(chunk)
+                num_samples += len(chunk) // 2
+
+            proc.wait()
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                _LOGGER.error(
+                    "Error recording from device %s: %s",
+                    device,
+                    stderr_file.read().decode("utf-8"),
+                )
+                return None
+
+        if num_samples < 1:
+            return 0.0
+
+        return math.sqrt(sum_squares / num_samples)
     except Exception:
         _LOGGER.exception("Error recording from device: %s", device)
         return None
@@ -145,6 +177,28 @@ def _record_proc(device: str) -> Optional[float]:
     return 0
 
 
+def _get_sum_squares_func() -> Callable[[bytes], float]:
+    """Get function that sums squared samples of 16-bit mono audio."""
+    try:
+        # Imported here so installer startup doesn't pay for numpy
+        import numpy as np
+    except ImportError:
+        # Installer may run with a bare system Python
+        return _get_sum_squares
+
+    def get_sum_squares_numpy(chunk: bytes) -> float:
+        # Sum of squares in a single pass (int64 avoids int16 overflow)
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.int64)
+        return int(samples.dot(samples))
+
+    return get_sum_squares_numpy
+
+
+def _get_sum_squares(chunk: bytes) -> float:
+    audio_array = array.array("h", chunk)
+    return sum(map(operator.mul, audio_array, audio_array))
+
+
 def configure_audio_settings(settings: Settings) -> None:
     choice: Optional[str] = None
     while True:
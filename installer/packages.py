@@ -2,7 +2,7 @@
 import logging
 import subprocess
 
-from .const import PROGRAM_DIR
+from .const import PROGRAM_DIR, SUDO
 from .whiptail import run_with_gauge
 
 _LOGGER = logging.getLogger()
@@ -27,11 +27,9 @@ def install_packages_nogui(*packages, update: bool = True) -> bool:
 
     commands = []
     if update:
-        commands.append(["sudo", "apt-get", "update"])
+        commands.append([SUDO, "apt-get", "update"])
 
-    commands.append(
-        ["sudo", "apt-get", "install", "--yes"] + [str(p) for p in packages]
-    )
+    commands.append([SUDO, "apt-get", "install", "--yes"] + [str(p) for p in packages])
 
     try:
         for command in commands:
@@ -52,10 +50,10 @@ def install_packages(
 
     commands = []
     if update:
-        commands.append(["sudo", "-S", "apt-get", "update"])
+        commands.append([SUDO, "-S", "apt-get", "update"])
 
     commands.append(
-        ["sudo", "-S", "apt-get", "install", "--yes"] + [str(p) for p in packages]
+        [SUDO, "-S", "apt-get", "install", "--yes"] + [str(p) for p in packages]
     )
 
     return run_with_gauge(text, commands, sudo_password=sudo_password)
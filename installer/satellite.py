@@ -1,7 +1,7 @@
 """Satellite settings."""
 from typing import Optional
 
-from .const import PROGRAM_DIR, SatelliteType, Settings
+from .const import PROGRAM_DIR, SUDO, SatelliteType, Settings
 from .whiptail import error, inputbox, menu, passwordbox, radiolist, run_with_gauge
 
 
@@ -36,7 +36,7 @@ def configure_satellite(settings: Settings) -> None:
             if not password:
                 continue
 
-            command = ["sudo", "-S", "systemctl", choice, "wyoming-satellite.service"]
+            command = [SUDO, "-S", "systemctl", choice, "wyoming-satellite.service"]
             text = {"restart": "Restarting", "stop": "Stopping", "start": "Starting"}[
                 choice
             ]
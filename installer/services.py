@@ -1,6 +1,7 @@
 """Systemd service management."""
+import os
+import pwd
 import shlex
-import subprocess
 from pathlib import Path
 from typing import List
 
@@ -8,6 +9,7 @@ from .const import (
     LOCAL_DIR,
     PROGRAM_DIR,
     SERVICES_DIR,
+    SUDO,
     SatelliteType,
     Settings,
     WakeWordSystem,
@@ -16,24 +18,31 @@ from .whiptail import error, msgbox, run_with_gauge
 
 
 def stop_services(password: str) -> None:
-    stop_commands = []
+    service_filenames = []
     for service in ("satellite", "wakeword", "event"):
         service_filename = f"wyoming-{service}.service"
         service_path = Path("/etc/systemd/system") / service_filename
         if not service_path.exists():
             continue
 
-        stop_commands.append(["sudo", "-S", "systemctl", "stop", service_filename])
-        stop_commands.append(["sudo", "-S", "systemctl", "disable", service_filename])
+        service_filenames.append(service_filename)
 
-    run_with_gauge("Stopping Services...", stop_commands, sudo_password=password)
+    if not service_filenames:
+        return
+
+    # Stop and disable all services with a single command
+    run_with_gauge(
+        "Stopping Services...",
+        [[SUDO, "-S", "systemctl", "disable", "--now", *service_filenames]],
+        sudo_password=password,
+    )
 
 
 def generate_services(settings: Settings) -> None:
     SERVICES_DIR.mkdir(parents=True, exist_ok=True)
 
-    user_id = subprocess.check_output(["id", "-u"], text=True).strip()
-    user_name = subprocess.check_output(["id", "--name", "-u"], text=True).strip()
+    user_id = os.getuid()
+    user_name = pwd.getpwuid(user_id).pw_name
 
     satellite_command: List[str] = [
         str(PROGRAM_DIR / "script" / "run"),
@@ -136,22 +145,21 @@ def generate_services(settings: Settings) -> None:
         with open(
             SERVICES_DIR / f"{wake_word_service}.service", "w", encoding="utf-8"
         ) as service_file:
-            print("[Unit]", file=service_file)
-            print(
-                f"Description={WakeWordSystem(settings.wake.system).value}",
-                file=service_file,
+            service_file.write(
+                "[Unit]\n"
+                f"Description={WakeWordSystem(settings.wake.system).value}\n"
+                "\n"
+                "[Service]\n"
+                "Type=simple\n"
+                f"User={user_name}\n"
+                f"ExecStart={wake_word_command_str}\n"
+                f"WorkingDirectory={wake_word_dir}\n"
+                "Restart=always\n"
+                "RestartSec=1\n"
+                "\n"
+                "[Install]\n"
+                "WantedBy=default.target\n"
             )
-            print("", file=service_file)
-            print("[Service]", file=service_file)
-            print("Type=simple", file=service_file)
-            print(f"User={user_name}", file=service_file)
-            print(f"ExecStart={wake_word_command_str}", file=service_file)
-            print(f"WorkingDirectory={wake_word_dir}", file=service_file)
-            print("Restart=always", file=service_file)
-            print("RestartSec=1", file=service_file)
-            print("", file=service_file)
-            print("[Install]", file=service_file)
-            print("WantedBy=default.target", file=service_file)
 
         satellite_command.extend(
             [
@@ -169,19 +177,21 @@ def generate_services(settings: Settings) -> None:
         with open(
             SERVICES_DIR / f"{event_service}.service", "w", encoding="utf-8"
         ) as service_file:
-            print("[Unit]", file=service_file)
-            print("Description=Event service", file=service_file)
-            print("", file=service_file)
-            print("[Service]", file=service_file)
-            print("Type=simple", file=service_file)
-            print(f"User={user_name}", file=service_file)
-            print(f"ExecStart={event_command_str}", file=service_file)
-            print(f"WorkingDirectory={PROGRAM_DIR}", file=service_file)
-            print("Restart=always", file=service_file)
-            print("RestartSec=1", file=service_file)
-            print("", file=service_file)
-            print("[Install]", file=service_file)
-            print("WantedBy=default.target", file=service_file)
+            service_file.write(
+                "[Unit]\n"
+                "Description=Event service\n"
+                "\n"
+                "[Service]\n"
+                "Type=simple\n"
+                f"User={user_name}\n"
+                f"ExecStart={event_command_str}\n"
+                f"WorkingDirectory={PROGRAM_DIR}\n"
+                "Restart=always\n"
+                "RestartSec=1\n"
+                "\n"
+                "[Install]\n"
+                "WantedBy=default.target\n"
+            )
 
         satellite_command.extend(["--event-uri", "tcp://127.0.0.1:10500"])
         satellite_requires.append(f"{event_service}.service")
@@ -192,32 +202,31 @@ def generate_services(settings: Settings) -> None:
         )
 
     satellite_command_str = shlex.join(satellite_command)
+    requires_str = "".join(f"Requires={requires}\n" for requires in satellite_requires)
 
     with open(
         SERVICES_DIR / "wyoming-satellite.service", "w", encoding="utf-8"
     ) as service_file:
-        print("[Unit]", file=service_file)
-        print("Description=Wyoming Satellite", file=service_file)
-        print("Wants=network-online.target", file=service_file)
-        print("After=network-online.target", file=service_file)
-        for requires in satellite_requires:
-            print(f"Requires={requires}", file=service_file)
-
-        print("", file=service_file)
-        print("[Service]", file=service_file)
-        print("Type=simple", file=service_file)
-        print(f"User={user_name}", file=service_file)
-
-        # For PulseAudio
-        print(f"Environment=XDG_RUNTIME_DIR=/run/user/{user_id}", file=service_file)
-
-        print(f"ExecStart={satellite_command_str}", file=service_file)
-        print(f"WorkingDirectory={PROGRAM_DIR}", file=service_file)
-        print("Restart=always", file=service_file)
-        print("RestartSec=1", file=service_file)
-        print("", file=service_file)
-        print("[Install]", file=service_file)
-        print("WantedBy=default.target", file=service_file)
+        service_file.write(
+            "[Unit]\n"
+            "Description=Wyoming Satellite\n"
+            "Wants=network-online.target\n"
+            "After=network-online.target\n"
+            f"{requires_str}"
+            "\n"
+            "[Service]\n"
+            "Type=simple\n"
+            f"User={user_name}\n"
+            # For PulseAudio
+            f"Environment=XDG_RUNTIME_DIR=/run/user/{user_id}\n"
+            f"ExecStart={satellite_command_str}\n"
+            f"WorkingDirectory={PROGRAM_DIR}\n"
+            "Restart=always\n"
+            "RestartSec=1\n"
+            "\n"
+            "[Install]\n"
+            "WantedBy=default.target\n"
+        )
 
 
 def install_services(settings: Settings, password: str):
@@ -230,28 +239,23 @@ def install_services(settings: Settings, password: str):
     if settings.satellite.event_service_command:
         installed_services.append("event")
 
-    install_commands = []
-    for service in installed_services:
-        service_filename = f"wyoming-{service}.service"
-        install_commands.append(
-            [
-                "sudo",
-                "-S",
-                "cp",
-                str(SERVICES_DIR / service_filename),
-                "/etc/systemd/system/",
-            ]
-        )
-
-    install_commands.append(["sudo", "-S", "systemctl", "daemon-reload"])
+    service_filenames = [f"wyoming-{service}.service" for service in installed_services]
 
     # Copy first, then enable and start
-    for service in installed_services:
-        install_commands.append(["sudo", "-S", "systemctl", "enable", service_filename])
-
-    install_commands.append(
-        ["sudo", "-S", "systemctl", "enable", "--now", "wyoming-satellite.service"]
-    )
+    install_commands = [
+        [
+            SUDO,
+            "-S",
+            "cp",
+            *(
+                str(SERVICES_DIR / service_filename)
+                for service_filename in service_filenames
+            ),
+            "/etc/systemd/system/",
+        ],
+        [SUDO, "-S", "systemctl", "daemon-reload"],
+        [SUDO, "-S", "systemctl", "enable", "--now", *service_filenames],
+    ]
 
     success = run_with_gauge(
         "Installing Services...", install_commands, sudo_password=password
@@ -1,9 +1,10 @@
 """Speaker settings."""
+import functools
 import logging
 import subprocess
 from typing import List, Optional
 
-from .const import PROGRAM_DIR, Settings
+from .const import APLAY, PROGRAM_DIR, Settings
 from .whiptail import checklist, inputbox, menu, msgbox, radiolist
 
 _LOGGER = logging.getLogger()
@@ -34,6 +35,9 @@ def configure_speakers(settings: Settings) -> None:
             if sound_device:
                 settings.snd.device = sound_device
                 settings.save()
+        elif choice == "rescan":
+            get_sound_devices.cache_clear()
+            msgbox(f"Found {len(get_sound_devices())} device(s)")
         elif choice == "manual":
             sound_device = inputbox("Enter ALSA Device:", settings.snd.device)
             if sound_device:
@@ -85,6 +89,7 @@ def speakers_menu(last_choice: Optional[str]) -> Optional[str]:
             ("test", "Test All Speakers"),
             ("list", "Select From List"),
             ("manual", "Enter Manually"),
+            ("rescan", "Rescan Devices"),
             ("disable", "Disable Sound"),
             ("multiplier", "Volume Multiplier"),
             ("feedback", "Toggle Feedback Sounds"),
@@ -94,21 +99,24 @@ def speakers_menu(last_choice: Optional[str]) -> Optional[str]:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_sound_devices() -> List[str]:
     devices = []
-    lines = subprocess.check_output(["aplay", "-L"]).decode("utf-8").splitlines()
+    # Filter before decoding since most lines are discarded
+    lines = subprocess.check_output([APLAY, "-L"]).splitlines()
     for line in lines:
         line = line.strip()
 
         # default = PulseAudio
-        if (line == "default") or line.startswith("plughw:"):
-            devices.append(line)
+        if (line == b"default") or line.startswith(b"plughw:"):
+            devices.append(line.decode("utf-8"))
 
     return devices
 
 
 def test_speakers() -> Optional[str]:
-    devices = get_sound_devices()
+    # Copy since devices are popped below
+    devices = list(get_sound_devices())
     if not devices:
         msgbox("No speakers found")
         return None
@@ -144,7 +152,7 @@ def test_speakers() -> Optional[str]:
 def test_sound_device(device: str) -> None:
     try:
         subprocess.check_call(
-            ["aplay", "-q", "-D", device, str(PROGRAM_DIR / "sounds" / "awake.wav")]
+            [APLAY, "-q", "-D", device, str(PROGRAM_DIR / "sounds" / "awake.wav")]
         )
     except Exception:
         _LOGGER.exception("Error testing device: %s", device)
@@ -3,7 +3,7 @@ import itertools
 import re
 import shutil
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 from .const import LOCAL_DIR, SatelliteType, Settings, WakeWordSystem
 from .packages import install_packages, packages_installed
@@ -18,6 +18,17 @@ from .whiptail import (
     yesno,
 )
 
+_WAKE_WORD_REPOS: Dict[WakeWordSystem, str] = {
+    WakeWordSystem.OPENWAKEWORD: "https://github.com/rhasspy/wyoming-openwakeword.git",
+    WakeWordSystem.PORCUPINE1: "https://github.com/rhasspy/wyoming-porcupine1.git",
+    WakeWordSystem.SNOWBOY: "https://github.com/rhasspy/wyoming-snowboy.git",
+}
+
+# System packages needed before running script/setup
+_WAKE_WORD_PACKAGES: Dict[WakeWordSystem, List[str]] = {
+    WakeWordSystem.SNOWBOY: ["python3-dev", "swig", "libatlas-base-dev"],
+}
+
 
 def configure_wake_word(settings: Settings) -> None:
     if settings.satellite.type != SatelliteType.WAKE:
@@ -73,230 +84,156 @@ def configure_wake_word(settings: Settings) -> None:
 
 
 def install_wake_word(settings: Settings, wake_word_system: WakeWordSystem) -> None:
-    if wake_word_system == WakeWordSystem.OPENWAKEWORD:
-        oww_dir = LOCAL_DIR / "wyoming-openwakeword"
-        if not oww_dir.exists():
-            if not yesno("Install openWakeWord?"):
+    name = wake_word_system.value
+    wake_word_dir = _get_wake_word_dir(wake_word_system)
+    if not wake_word_dir.exists():
+        if not yesno(f"Install {name}?"):
+            return
+
+        system_packages = _WAKE_WORD_PACKAGES.get(wake_word_system)
+        if system_packages and (not packages_installed(*system_packages)):
+            password = passwordbox("sudo password:")
+            if not password:
                 return
 
-            success = run_with_gauge(
-                "Installing openWakeWord",
-                [
-                    [
-                        "git",
-                        "clone",
-                        "https://github.com/rhasspy/wyoming-openwakeword.git",
-                        str(oww_dir),
-                    ],
-                    [str(oww_dir / "script" / "setup")],
-                ],
+            success = install_packages(
+                "Installing system packages...", password, *system_packages
             )
-
             if not success:
-                # Clean up
-                try:
-                    shutil.rmtree(oww_dir)
-                except Exception:
-                    pass
-
-                error("installing openWakeWord")
+                error("installing " + ", ".join(system_packages))
                 return
 
-        msgbox("openWakeWord installed successfully")
-        settings.wake.system = wake_word_system
-        settings.save()
-        return
-
-    if wake_word_system == WakeWordSystem.PORCUPINE1:
-        porcupine1_dir = LOCAL_DIR / "wyoming-porcupine1"
-        if not porcupine1_dir.exists():
-            if not yesno("Install porcupine1?"):
-                return
-
-            success = run_with_gauge(
-                "Installing porcupine1",
+        success = run_with_gauge(
+            f"Installing {name}",
+            [
                 [
-                    [
-                        "git",
-                        "clone",
-                        "https://github.com/rhasspy/wyoming-porcupine1.git",
-                        str(porcupine1_dir),
-                    ],
-                    [str(porcupine1_dir / "script" / "setup")],
+                    "git",
+                    "clone",
+                    _WAKE_WORD_REPOS[wake_word_system],
+                    str(wake_word_dir),
                 ],
-            )
-
-            if not success:
-                # Clean up
-                try:
-                    shutil.rmtree(porcupine1_dir)
-                except Exception:
-                    pass
-
-                error("installing porcupine1")
-                return
-
-        msgbox("porcupine1 installed successfully")
-        settings.wake.system = wake_word_system
-        settings.save()
-        return
+                [str(wake_word_dir / "script" / "setup")],
+            ],
+        )
 
-    if wake_word_system == WakeWordSystem.SNOWBOY:
-        snowboy_dir = LOCAL_DIR / "wyoming-snowboy"
-        if not snowboy_dir.exists():
-            if not yesno("Install snowboy?"):
-                return
+        if not success:
+            # Clean up
+            try:
+                shutil.rmtree(wake_word_dir)
+            except Exception:
+                pass
 
-            snowboy_packages = ["python3-dev", "swig", "libatlas-base-dev"]
-            if not packages_installed(*snowboy_packages):
-                password = passwordbox("sudo password:")
-                if not password:
-                    return
+            error(f"installing {name}")
+            return
 
-                success = install_packages(
-                    "Installing system packages...", password, *snowboy_packages
-                )
-                if not success:
-                    error("installing " + ", ".join(snowboy_packages))
-                    return
+    msgbox(f"{name} installed successfully")
+    settings.wake.system = wake_word_system
+    settings.save()
 
-            success = run_with_gauge(
-                "Installing snowboy",
-                [
-                    [
-                        "git",
-                        "clone",
-                        "https://github.com/rhasspy/wyoming-snowboy.git",
-                        str(snowboy_dir),
-                    ],
-                    [str(snowboy_dir / "script" / "setup")],
-                ],
-            )
 
-            if not success:
-                # Clean up
-                try:
-                    shutil.rmtree(snowboy_dir)
-                except Exception:
-                    pass
+def _get_wake_word_dir(wake_word_system: WakeWordSystem) -> Path:
+    return LOCAL_DIR / f"wyoming-{wake_word_system.value.lower()}"
 
-                error("installing snowboy")
-                return
 
-        msgbox("snowboy installed successfully")
-        settings.wake.system = wake_word_system
-        settings.save()
+def select_wake_word(settings: Settings) -> None:
+    if settings.wake.system is None:
         return
 
+    wake_word_system = WakeWordSystem(settings.wake.system)
+    wake_word_dir = _get_wake_word_dir(wake_word_system)
+    if not wake_word_dir.exists():
+        msgbox(f"{wake_word_system.value} is not installed")
+        return
 
-def select_wake_word(settings: Settings) -> None:
-    if settings.wake.system == WakeWordSystem.OPENWAKEWORD:
-        oww_dir = LOCAL_DIR / "wyoming-openwakeword"
-        if not oww_dir.exists():
-            msgbox("openWakeWord is not installed")
-            return
-
-        custom_wake_word_dir = LOCAL_DIR / "custom-wake-words" / "openWakeWord"
-        custom_wake_word_dir.mkdir(parents=True, exist_ok=True)
+    _SELECT_WAKE_WORD[wake_word_system](settings, wake_word_dir)
 
-        community_wake_word_dir = LOCAL_DIR / "home-assistant-wakewords-collection"
 
-        while True:
-            ww_paths: Dict[str, Path] = {
-                p.stem: p for p in custom_wake_word_dir.glob("*.tflite")
-            }
+def _select_openwakeword(settings: Settings, oww_dir: Path) -> None:
+    custom_wake_word_dir = LOCAL_DIR / "custom-wake-words" / "openWakeWord"
+    custom_wake_word_dir.mkdir(parents=True, exist_ok=True)
 
-            for ww_path in community_wake_word_dir.rglob("*.tflite"):
-                ww_name = ww_path.stem
-                if ww_name in ww_paths:
-                    continue
+    community_wake_word_dir = LOCAL_DIR / "home-assistant-wakewords-collection"
 
-                ww_paths[ww_name] = ww_path
+    while True:
+        ww_paths: Dict[str, Path] = {
+            p.stem: p for p in custom_wake_word_dir.glob("*.tflite")
+        }
 
-            for ww_path in (oww_dir / "wyoming_openwakeword" / "models").glob(
-                "*.tflite"
-            ):
-                if not re.match("^.+_v[0-9].*$", ww_path.stem):
-                    continue
+        for ww_path in community_wake_word_dir.rglob("*.tflite"):
+            ww_name = ww_path.stem
+            if ww_name in ww_paths:
+                continue
 
-                ww_name = ww_path.stem.rsplit("_", maxsplit=1)[0]
-                if ww_name in ww_paths:
-                    continue
+            ww_paths[ww_name] = ww_path
 
-                ww_paths[ww_name] = ww_path
+        for ww_path in (oww_dir / "wyoming_openwakeword" / "models").glob("*.tflite"):
+            if not re.match("^.+_v[0-9].*$", ww_path.stem):
+                continue
 
-            items = sorted(list(ww_paths.keys()))
-            wake_word = radiolist(
-                "Wake Word:", items, settings.wake.openwakeword.wake_word
-            )
-            if wake_word is None:
-                break
+            ww_name = ww_path.stem.rsplit("_", maxsplit=1)[0]
+            if ww_name in ww_paths:
+                continue
 
-            wake_word_path = ww_paths[wake_word]
-            if wake_word_path.is_relative_to(community_wake_word_dir):
-                # Copy to custom directory
-                shutil.copy(wake_word_path, custom_wake_word_dir)
+            ww_paths[ww_name] = ww_path
 
-            settings.wake.openwakeword.wake_word = wake_word
-            settings.save()
+        items = sorted(list(ww_paths.keys()))
+        wake_word = radiolist("Wake Word:", items, settings.wake.openwakeword.wake_word)
+        if wake_word is None:
             break
 
-        return
+        wake_word_path = ww_paths[wake_word]
+        if wake_word_path.is_relative_to(community_wake_word_dir):
+            # Copy to custom directory
+            shutil.copy(wake_word_path, custom_wake_word_dir)
 
-    if settings.wake.system == WakeWordSystem.PORCUPINE1:
-        porcupine1_dir = LOCAL_DIR / "wyoming-porcupine1"
-        if not porcupine1_dir.exists():
-            msgbox("porcupine1 is not installed")
-            return
+        settings.wake.openwakeword.wake_word = wake_word
+        settings.save()
+        break
 
-        ww_names = sorted(
-            list(
-                set(
-                    p.stem.rsplit("_", maxsplit=1)[0]
-                    for p in (
-                        porcupine1_dir / "wyoming_porcupine1" / "data" / "resources"
-                    ).rglob("*.ppn")
-                )
-            )
-        )
 
-        wake_word = radiolist(
-            "Wake Word:", ww_names, settings.wake.porcupine1.wake_word
+def _select_porcupine1(settings: Settings, porcupine1_dir: Path) -> None:
+    ww_names = sorted(
+        list(
+            set(
+                p.stem.rsplit("_", maxsplit=1)[0]
+                for p in (
+                    porcupine1_dir / "wyoming_porcupine1" / "data" / "resources"
+                ).rglob("*.ppn")
+            )
         )
-        if wake_word is not None:
-            settings.wake.porcupine1.wake_word = wake_word
-            settings.save()
+    )
 
-        return
+    wake_word = radiolist("Wake Word:", ww_names, settings.wake.porcupine1.wake_word)
+    if wake_word is not None:
+        settings.wake.porcupine1.wake_word = wake_word
+        settings.save()
 
-    if settings.wake.system == WakeWordSystem.SNOWBOY:
-        snowboy_dir = LOCAL_DIR / "wyoming-snowboy"
-        if not snowboy_dir.exists():
-            msgbox("snowboy is not installed")
-            return
 
-        custom_wake_word_dir = LOCAL_DIR / "custom-wake-words" / "snowboy"
-        custom_wake_word_dir.mkdir(parents=True, exist_ok=True)
+def _select_snowboy(settings: Settings, snowboy_dir: Path) -> None:
+    custom_wake_word_dir = LOCAL_DIR / "custom-wake-words" / "snowboy"
+    custom_wake_word_dir.mkdir(parents=True, exist_ok=True)
 
-        builtin_wake_words = (snowboy_dir / "wyoming_snowboy" / "data").glob("*.umdl")
-        custom_wake_words = itertools.chain(
-            custom_wake_word_dir.glob("*.pmdl"), custom_wake_word_dir.glob("*.umdl")
-        )
-        ww_names = sorted(
-            list(
-                set(
-                    p.stem
-                    for p in itertools.chain(builtin_wake_words, custom_wake_words)
-                )
-            )
+    builtin_wake_words = (snowboy_dir / "wyoming_snowboy" / "data").glob("*.umdl")
+    custom_wake_words = itertools.chain(
+        custom_wake_word_dir.glob("*.pmdl"), custom_wake_word_dir.glob("*.umdl")
+    )
+    ww_names = sorted(
+        list(
+            set(p.stem for p in itertools.chain(builtin_wake_words, custom_wake_words))
         )
+    )
+
+    wake_word = radiolist("Wake Word:", ww_names, settings.wake.snowboy.wake_word)
+    if wake_word is not None:
+        settings.wake.snowboy.wake_word = wake_word
+        settings.save()
 
-        wake_word = radiolist("Wake Word:", ww_names, settings.wake.snowboy.wake_word)
-        if wake_word is not None:
-            settings.wake.snowboy.wake_word = wake_word
-            settings.save()
 
-        return
+_SELECT_WAKE_WORD: Dict[WakeWordSystem, Callable[[Settings, Path], None]] = {
+    WakeWordSystem.OPENWAKEWORD: _select_openwakeword,
+    WakeWordSystem.PORCUPINE1: _select_porcupine1,
+    WakeWordSystem.SNOWBOY: _select_snowboy,
+}
 
 
 def configure_openWakeWord(settings: Settings) -> None:
@@ -1,13 +1,15 @@
 """Python interface to whiptail command."""
 import logging
+import os
 import shlex
 import subprocess
+import threading
 import time
 from collections.abc import Sequence
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from .const import HEIGHT, LIST_HEIGHT, TITLE, WIDTH
+from .const import HEIGHT, LIST_HEIGHT, SUDO, TITLE, WHIPTAIL, WIDTH
 
 ItemType = Union[str, Tuple[Any, str]]
 
@@ -16,7 +18,7 @@ _LOGGER = logging.getLogger()
 
 def whiptail(*args) -> Optional[str]:
     proc = subprocess.Popen(
-        ["whiptail", "--title", TITLE] + list(args),
+        [WHIPTAIL, "--title", TITLE] + list(args),
         stderr=subprocess.PIPE,
     )
 
@@ -35,25 +37,15 @@ def menu(
 ) -> Optional[str]:
     assert items, "No items"
 
-    item_map: Dict[Optional[str], str] = {}
-    item_args: List[str] = []
-    selected_tag: Optional[str] = None
-    for i, item in enumerate(items):
-        item_id = str(i)
-        item_args.append(item_id)
-
-        if isinstance(item, str):
-            item_map[item_id] = item
-            item_args.append(item)
-
-            if selected_item == item:
-                selected_tag = item_id
-        else:
-            item_map[item_id] = item[0]
-            item_args.append(item[1])
-
-            if selected_item == item[0]:
-                selected_tag = item_id
+    item_map, item_args = _get_item_args(items)
+    selected_tag: Optional[str] = next(
+        (
+            item_id
+            for item_id, item_value in item_map.items()
+            if item_value == selected_item
+        ),
+        None,
+    )
 
     menu_args = list(menu_args) if menu_args is not None else []
     if selected_tag is not None:
@@ -62,6 +54,10 @@ def menu(
     result = whiptail(
         "--notags", *menu_args, "--menu", text, HEIGHT, WIDTH, LIST_HEIGHT, *item_args
     )
+
+    if result is None:
+        return None
+
     return item_map.get(result)
 
 
@@ -83,28 +79,9 @@ def radiolist(
 ) -> Optional[Any]:
     assert items, "No items"
 
-    item_map: Dict[str, ItemType] = {}
-    item_args: List[str] = []
-    for i, item in enumerate(items):
-        item_id = str(i)
-        item_args.append(item_id)
-
-        if isinstance(item, str):
-            item_map[item_id] = item
-            item_args.append(item)
-
-            if item == selected_item:
-                item_args.append("1")
-            else:
-                item_args.append("0")
-        else:
-            item_map[item_id] = item[0]
-            item_args.append(item[1])
-
-            if item[0] == selected_item:
-                item_args.append("1")
-            else:
-                item_args.append("0")
+    item_map, item_args = _get_item_args(
+        items, lambda item_value: item_value == selected_item
+    )
 
     result = whiptail(
         "--notags", *args, "--radiolist", text, HEIGHT, WIDTH, LIST_HEIGHT, *item_args
@@ -124,28 +101,9 @@ def checklist(
 ) -> Optional[List[Any]]:
     assert items, "No items"
 
-    item_map: Dict[str, ItemType] = {}
-    item_args: List[str] = []
-    for i, item in enumerate(items):
-        item_id = str(i)
-        item_args.append(item_id)
-
-        if isinstance(item, str):
-            item_map[item_id] = item
-            item_args.append(item)
-
-            if item in selected_items:
-                item_args.append("1")
-            else:
-                item_args.append("0")
-        else:
-            item_map[item_id] = item[0]
-            item_args.append(item[1])
-
-            if item[0] in selected_items:
-                item_args.append("1")
-            else:
-                item_args.append("0")
+    item_map, item_args = _get_item_args(
+        items, lambda item_value: item_value in selected_items
+    )
 
     result = whiptail(
         "--notags", *args, "--checklist", text, HEIGHT, WIDTH, LIST_HEIGHT, *item_args
@@ -159,6 +117,33 @@ def checklist(
     ]
 
 
+def _get_item_args(
+    items: Sequence[ItemType], is_selected: Optional[Callable[[Any], bool]] = None
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Get map from whiptail tag to item value and (tag, label[, status]) args."""
+    stride = 2 if is_selected is None else 3
+    item_map: Dict[str, Any] = {}
+
+    # Final size is known, so fill in place instead of appending
+    item_args: List[str] = [""] * (stride * len(items))
+    for i, item in enumerate(items):
+        item_id = str(i)
+        if isinstance(item, str):
+            item_value, item_label = item, item
+        else:
+            item_value, item_label = item
+
+        item_map[item_id] = item_value
+
+        base = stride * i
+        item_args[base] = item_id
+        item_args[base + 1] = item_label
+        if is_selected is not None:
+            item_args[base + 2] = "1" if is_selected(item_value) else "0"
+
+    return item_map, item_args
+
+
 def yesno(text: str) -> bool:
     return whiptail("--yesno", text, HEIGHT, WIDTH) is not None
 
@@ -169,22 +154,27 @@ def msgbox(text: str) -> None:
 
 def gauge(text: str, seconds: int, parts: int = 20) -> None:
     proc = subprocess.Popen(
-        ["whiptail", "--title", TITLE, "--gauge", text, HEIGHT, WIDTH, "0"],
+        [WHIPTAIL, "--title", TITLE, "--gauge", text, HEIGHT, WIDTH, "0"],
         stdin=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
     )
     assert proc.stdin is not None
+    gauge_fd = proc.stdin.fileno()
 
     percent = 0
     while percent <= 100:
         time.sleep(seconds / parts)
         percent += int(100 / parts)
-        print(percent, file=proc.stdin, flush=True)
+        _update_gauge(gauge_fd, percent)
 
     proc.communicate()
 
 
+def _update_gauge(gauge_fd: int, percent: int) -> None:
+    # Unbuffered write, one syscall per update
+    os.write(gauge_fd, b"%d\n" % percent)
+
+
 def error(reason: str) -> None:
     msgbox(
         f"An error occurred while {reason}.\n" "See local/installer.log for details."
@@ -198,26 +188,30 @@ def run_with_gauge(
     text: str, commands: Sequence[Sequence[str]], sudo_password: Optional[str] = None
 ) -> bool:
     proc = subprocess.Popen(
-        ["whiptail", "--title", TITLE, "--gauge", text, HEIGHT, WIDTH, "0"],
+        [WHIPTAIL, "--title", TITLE, "--gauge", text, HEIGHT, WIDTH, "0"],
         stdin=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
     )
     assert proc.stdin is not None
+    gauge_fd = proc.stdin.fileno()
     percent = 0
     seconds = 5
     parts = 20
 
     with ThreadPoolExecutor() as executor:
+        done_event = threading.Event()
         for command in commands:
+            done_event.clear()
             future = executor.submit(_run_command, command, sudo_password)
-            while not future.done():
-                time.sleep(seconds / parts)
+            future.add_done_callback(lambda _future: done_event.set())
+
+            # Wake up to update the gauge, or as soon as the command is done
+            while not done_event.wait(seconds / parts):
                 percent += int(100 / parts)
                 if percent > 100:
                     percent = 0
 
-                print(percent, file=proc.stdin, flush=True)
+                _update_gauge(gauge_fd, percent)
 
             if not future.result():
                 # Error occurred
@@ -230,21 +224,20 @@ def run_with_gauge(
 def _run_command(command: Sequence[str], sudo_password: Optional[str] = None) -> bool:
     try:
         assert command
-        proc_input: Optional[str] = None
-        if (command[0] == "sudo") and (sudo_password is not None):
-            proc_input = sudo_password
+        proc_input: Optional[bytes] = None
+        if (command[0] == SUDO) and (sudo_password is not None):
+            proc_input = sudo_password.encode("utf-8")
 
         proc = subprocess.Popen(
             command,
             stdin=subprocess.PIPE,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
-            text=True,
         )
         _stdout, stderr = proc.communicate(proc_input)
         if proc.returncode != 0:
             _LOGGER.error("Error running command: %s", command)
-            _LOGGER.error(stderr)
+            _LOGGER.error(stderr.decode("utf-8", errors="replace"))
             return False
     except Exception:
         _LOGGER.exception("Error running command: %s", command)